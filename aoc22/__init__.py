@@ -0,0 +1,58 @@
+"""Advent of Code 2022 - importable package
+
+The solutions are standalone scripts in day-NN directories, which are not valid package
+names. Each is exposed here as a submodule (e.g., aoc22.day05) that is only loaded the
+first time it is imported or accessed as an attribute.
+"""
+
+from __future__ import annotations
+from importlib.util import spec_from_file_location
+import importlib
+import os
+import sys
+
+
+# note: using os.path rather than pathlib and a plain finder class rather than 
+#   importlib.abc, both of which are comparatively slow to import
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# submodule name to script path, relative to the repository root
+DAYS = {
+    'day01': 'day-01/nutritional_facts.py',
+    'day02': 'day-02/rock_paper_scissors.py',
+    'day03': 'day-03/rucksack.py',
+    'day04': 'day-04/cleanup_crew.py',
+    'day05': 'day-05/hard_working_crane.py',
+    'day06': 'day-06/packets.py',
+    'day07': 'day-07/disk_saver.py',
+    'day08': 'day-08/leaf_peeper.py',
+    'day09': 'day-09/inchworm.py',
+    'day10': 'day-10/register.py',
+}
+
+
+__all__ = list(DAYS)
+
+
+class _DayFinder:
+    """Find the day-NN scripts when aoc22.dayNN is imported"""
+
+    def find_spec(self, fullname, path, target=None):
+        package, _, name = fullname.rpartition('.')
+        if package != __name__ or name not in DAYS:
+            return None
+        return spec_from_file_location(fullname, os.path.join(ROOT, DAYS[name]))
+
+
+sys.meta_path.append(_DayFinder())
+
+
+def __getattr__(name: str):
+    if name in DAYS:
+        return importlib.import_module(f'{__name__}.{name}')
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *DAYS})
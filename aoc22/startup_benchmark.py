@@ -0,0 +1,70 @@
+"""Check that cold imports of the package and of each day stay within a time budget,
+and that importing them does not pull in optional dependencies
+
+Usage: python -m aoc22.startup_benchmark [budget_ms]
+"""
+
+from __future__ import annotations
+import subprocess
+import sys
+
+from aoc22 import DAYS, ROOT
+
+
+# budget for a cold import of any single module, in milliseconds
+DEFAULT_BUDGET_MS = 100
+
+# modules that should only be imported by the functions that use them
+OPTIONAL_MODULES = ('numpy', 'asyncio')
+
+# number of fresh interpreters to time each import in, keeping the fastest
+REPEATS = 5
+
+
+_TIMER = '''
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(elapsed * 1000, *(x for x in {optional!r} if x in sys.modules))
+'''
+
+
+def cold_import(module: str) -> tuple[float, list[str]]:
+    """Import 'module' in a fresh interpreter, return the import time in milliseconds and
+    the list of optional modules it loaded
+    """
+    result = subprocess.run(
+        [sys.executable, '-c', _TIMER.format(module=module, optional=OPTIONAL_MODULES)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    elapsed, *loaded = result.stdout.split()
+    return float(elapsed), loaded
+
+
+def main(budget_ms: float = DEFAULT_BUDGET_MS) -> bool:
+    """Print cold import times for the package and each day, return True if all are
+    within budget and none loaded optional modules
+    """
+    ok = True
+    for module in [__package__, *(f'{__package__}.{x}' for x in DAYS)]:
+        timings = [cold_import(module) for _ in range(REPEATS)]
+        elapsed = min(x[0] for x in timings)
+        loaded = timings[0][1]
+
+        status = 'ok'
+        if elapsed > budget_ms:
+            status = 'OVER BUDGET'
+        if loaded:
+            status = f'LOADED {", ".join(loaded)}'
+        ok &= status == 'ok'
+
+        print(f'{module:14} {elapsed:8.2f} ms  {status}')
+
+    return ok
+
+
+if __name__ == '__main__':
+
+    budget_ms = float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BUDGET_MS
+    sys.exit(0 if main(budget_ms) else 1)
@@ -1,9 +1,14 @@
 """Advent of Code 2022 - Day 1 - Calorie Counting
 """
 from pathlib import Path
+from typing import Iterator
+import heapq
+import os
+import time
 
 
-INPUT = Path('input.txt')
+DATA_DIR = Path(__file__).parent
+INPUT = DATA_DIR / 'input.txt'
 
 
 def max_calories_carried_by_one_elf(food_list_path):
@@ -51,8 +56,79 @@ def top_calories_carried(food_list_path):
     return sum(max_elf_calories)
 
 
+class FoodListFollower:
+    """Follow a food list file that is being appended to, remembering where reading 
+    stopped so that each update only processes the newly appended bytes. As for the 
+    functions above, an elf is counted once the blank line after its food is read.
+    """
+
+    def __init__(self, food_list_path, top_k=3):
+        self.food_list_path = food_list_path
+        self.top_k = top_k
+        self.reset()
+
+    def reset(self):
+        """Forget everything read so far and start again from the top of the file"""
+        self.offset = 0
+        self._partial_line = b''
+        self._elf_calories = 0
+        self._top_elves = []  # min-heap of the top_k elf totals
+
+    def update(self) -> int:
+        """Read and process any bytes appended to the file since the last update.
+        Return the number of new bytes read.
+        """
+        if os.stat(self.food_list_path).st_size < self.offset:
+            # file was truncated or replaced, start over
+            self.reset()
+
+        with open(self.food_list_path, 'rb') as fp:
+            fp.seek(self.offset)
+            data = fp.read()
+        self.offset += len(data)
+
+        *lines, self._partial_line = (self._partial_line + data).split(b'\n')
+        for line in lines:
+            if line.strip():
+                self._elf_calories += int(line)
+            else:
+                # new elf!
+                if len(self._top_elves) < self.top_k:
+                    heapq.heappush(self._top_elves, self._elf_calories)
+                else:
+                    heapq.heappushpop(self._top_elves, self._elf_calories)
+                self._elf_calories = 0
+
+        return len(data)
+
+    def follow(self, poll_interval: float = 1.0) -> Iterator[int]:
+        """Generator that waits for the file to grow, updating and yielding the number
+        of new bytes read each time it does
+        """
+        while True:
+            if os.stat(self.food_list_path).st_size != self.offset:
+                yield self.update()
+            else:
+                time.sleep(poll_interval)
+
+    def max_calories_carried_by_one_elf(self) -> int:
+        """Return the number of calories carried by the elf with the most calories so far
+        """
+        return max(self._top_elves, default=-1)
+
+    def top_calories_carried(self) -> int:
+        """Return the sum of calories carried by the top_k elves with the most calories so far
+        """
+        return sum(self._top_elves)
+
+
 
 if __name__ == '__main__':
 
     print(f'Maximum calories carried by any elf: {max_calories_carried_by_one_elf(INPUT)}')
     print(f'Total calories carried by top-3 elves: {top_calories_carried(INPUT)}')
+
+    follower = FoodListFollower(INPUT)
+    follower.update()
+    print(f'[FOLLOW] Maximum calories carried by any elf: {follower.max_calories_carried_by_one_elf()}')
+    print(f'[FOLLOW] Total calories carried by top-3 elves: {follower.top_calories_carried()}')
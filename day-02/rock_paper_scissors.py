@@ -1,15 +1,20 @@
 """Rock, paper, scissors tournament
 """
 
+from __future__ import annotations
+from collections import Counter
+from itertools import permutations
 from types import MappingProxyType
 from pathlib import Path
-from typing import Mapping
+from typing import Iterable, Iterator, Mapping
 
 
+DATA_DIR = Path(__file__).parent
+
 # path to input file containing lines with [ABC] [XYZ] pairs representing a
 #   rock-paper-scissors "strategy guide". It's meaning depends on the problem part
 #   (i.e., 1 or 2)
-INPUT = Path('input.txt')
+INPUT = DATA_DIR / 'input.txt'
 
 
 # Scores according to part-1 interpretation of the strategy guide, i.e., 
@@ -59,8 +64,116 @@ def play(strategy_file: Path, scoring_table: Mapping) -> int:
     return my_score
 
 
+# row / column labels for the 3x3 pair-count and scoring-table arrays
+OPPONENT_MOVES = ('A', 'B', 'C')
+PLAYER_CODES = ('X', 'Y', 'Z')
+
+# shape and outcome scores, indexed by move (0: rock, 1: paper, 2: scissors)
+#   and outcome (0: lose, 1: draw, 2: win)
+SHAPE_SCORES = (1, 2, 3)
+OUTCOME_SCORES = (0, 3, 6)
+
+
+def _outcome(opponent: int, me: int) -> int:
+    """Return the outcome index of playing move 'me' against move 'opponent'"""
+    return (me - opponent + 1) % 3
+
+
+def _response(opponent: int, outcome: int) -> int:
+    """Return the move index that achieves 'outcome' against move 'opponent'"""
+    return (opponent + outcome - 1) % 3
+
+
+def pair_counts(strategy_file: Path) -> np.ndarray:
+    """Read the "strategy guide" in strategy_file once and return a 3x3 array counting
+    each (opponent, player) pair, rows ordered as OPPONENT_MOVES, cols as PLAYER_CODES
+    """
+    import numpy as np
+
+    with open(strategy_file, 'r') as fp:
+        tokens = fp.read().split()
+    if len(tokens) % 2:
+        raise ValueError(f'Expect pairs of codes in {strategy_file}')
+    counts = np.zeros((3, 3), dtype=np.int64)
+    for (opponent, me), count in Counter(zip(tokens[0::2], tokens[1::2])).items():
+        counts[OPPONENT_MOVES.index(opponent), PLAYER_CODES.index(me)] = count
+    return counts
+
+
+def table_array(scoring_table: Mapping) -> np.ndarray:
+    """Convert a scoring lookup table (like PART_1_SCORES) to a 3x3 array with the
+    same layout as pair_counts
+    """
+    import numpy as np
+
+    return np.array(
+        [[scoring_table[(opponent, me)] for me in PLAYER_CODES] for opponent in OPPONENT_MOVES],
+        dtype=np.int64,
+    )
+
+
+def move_table(moves: tuple[int, int, int]) -> Mapping:
+    """Return the part-1 style scoring table in which X, Y, Z mean the moves in 'moves'"""
+    return MappingProxyType(
+        {
+            (opponent, code): SHAPE_SCORES[me] + OUTCOME_SCORES[_outcome(i, me)]
+            for i, opponent in enumerate(OPPONENT_MOVES)
+            for code, me in zip(PLAYER_CODES, moves)
+        }
+    )
+
+
+def outcome_table(outcomes: tuple[int, int, int]) -> Mapping:
+    """Return the part-2 style scoring table in which X, Y, Z mean the outcomes in 'outcomes'"""
+    return MappingProxyType(
+        {
+            (opponent, code): OUTCOME_SCORES[outcome] + SHAPE_SCORES[_response(i, outcome)]
+            for i, opponent in enumerate(OPPONENT_MOVES)
+            for code, outcome in zip(PLAYER_CODES, outcomes)
+        }
+    )
+
+
+def all_scoring_tables() -> Iterator[tuple[str, Mapping]]:
+    """Generator yielding (label, table) for every mapping of X/Y/Z to moves and to outcomes
+    """
+    for moves in permutations(range(3)):
+        label = ''.join('RPS'[x] for x in moves)
+        yield f'moves:{label}', move_table(moves)
+    for outcomes in permutations(range(3)):
+        label = ''.join('LDW'[x] for x in outcomes)
+        yield f'outcomes:{label}', outcome_table(outcomes)
+
+
+def play_many(strategy_file: Path, scoring_tables: Iterable[Mapping]) -> np.ndarray:
+    """Play the "strategy guide" in strategy_file once for each of 'scoring_tables'.
+    The file is read once, all tables are scored with a single matrix multiply.
+    Return an array of the player's total score for each table (in order).
+    """
+    import numpy as np
+
+    tables = [table_array(x) for x in scoring_tables]
+    if not tables:
+        return np.zeros(0, dtype=np.int64)
+    return np.stack(tables).reshape(len(tables), 9) @ pair_counts(strategy_file).reshape(9)
+
+
+def rank_scoring_tables(
+    strategy_file: Path, 
+    scoring_tables: Mapping[str, Mapping]
+) -> list[tuple[str, int]]:
+    """Return (label, score) for each labeled scoring table, best score first
+    """
+    labels = list(scoring_tables)
+    scores = play_many(strategy_file, scoring_tables.values())
+    return sorted(zip(labels, scores.tolist()), key=lambda x: x[1], reverse=True)
+
+
 
 if __name__ == '__main__':
     
     print(f'PART 1: My score is: {play(INPUT, PART_1_SCORES)}')
     print(f'PART 2: My score is: {play(INPUT, PART_2_SCORES)}')
+    print()
+    for label, score in rank_scoring_tables(INPUT, dict(all_scoring_tables())):
+        print(f'[{label:12}] My score is: {score}')
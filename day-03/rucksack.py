@@ -1,12 +1,16 @@
 """Reorganizing untidy rucksacks
 """
 
+from __future__ import annotations
+from attrs import frozen
+from functools import cache
 from pathlib import Path
 from typing import Mapping
 
 
-SAMPLE_INPUT = Path('sample-input.txt')
-INPUT = Path('input.txt')
+DATA_DIR = Path(__file__).parent
+SAMPLE_INPUT = DATA_DIR / 'sample-input.txt'
+INPUT = DATA_DIR / 'input.txt'
 
 
 PRIORITIZED_ITEMS = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ'
@@ -59,6 +63,96 @@ def total_badge_priority(rucksack_path: Path) -> int:
                 break
             total_priority += PRIORITY[badge(sacks)]
     return total_priority
+
+
+@cache
+def _item_bits() -> np.ndarray:
+    """Return lookup table from byte value to a bitmask with the item's priority bit set
+    (0 if not an item)
+    """
+    import numpy as np
+
+    item_bits = np.zeros(256, dtype=np.uint64)
+    for item, priority in PRIORITY.items():
+        item_bits[ord(item)] = np.uint64(1) << np.uint64(priority)
+    return item_bits
+
+
+@frozen
+class BatchPriorities:
+    """Results of scoring a whole rucksack file at once. Totals only include valid sacks 
+    and groups, the indices (counting non-empty lines from 0) of invalid ones are listed.
+    """
+    common_item_priority: int
+    badge_priority: int
+    bad_sacks: np.ndarray
+    bad_groups: np.ndarray
+
+
+def _single_item_priorities(masks: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return the priority of the single item in each mask, and a flag that is True 
+    where masks do not contain exactly one item (priority is then meaningless)
+    """
+    import numpy as np
+
+    bad = (masks == 0) | (masks & (masks - np.uint64(1)) != 0)
+    # a single set bit converts exactly to float, with the bit index as the exponent
+    _, exponent = np.frexp(masks.astype(np.float64))
+    return exponent - 1, bad
+
+
+def batch_priorities(rucksack_path: Path, group_size: int = 3) -> BatchPriorities:
+    """Return the total priority of common items and of badges for groups of 
+    'group_size' elves, computed from one vectorized pass over the whole file
+    """
+    import numpy as np
+
+    if group_size < 1:
+        raise ValueError(f'Expect at least 1 elf per group: {group_size}')
+
+    with open(rucksack_path, 'rb') as fp:
+        data = np.frombuffer(fp.read() + b'\n', dtype=np.uint8)
+
+    # locate lines, stripped of leading/trailing whitespace (as str.strip), dropping empty
+    #   lines, and the midpoint dividing their compartments
+    line_ends = np.flatnonzero(data == ord('\n'))
+    line_starts = np.concatenate([[0], line_ends[:-1] + 1])
+    solid = np.flatnonzero(~np.isin(data, np.frombuffer(b' \t\n\r\x0b\x0c', dtype=np.uint8)))
+    first = np.searchsorted(solid, line_starts)
+    last = np.searchsorted(solid, line_ends) - 1
+    keep = first <= last
+    starts, ends = solid[first[keep]], solid[last[keep]] + 1
+    lengths = ends - starts
+    middles = starts + lengths // 2
+
+    if not len(starts):
+        empty = np.array([], dtype=np.int64)
+        return BatchPriorities(0, 0, empty, empty)
+
+    # OR-reduce each compartment, the third segment is the gap before the next sack
+    bits = _item_bits()[data]
+    bounds = np.stack([starts, middles, ends], axis=1).ravel()
+    compartments = np.bitwise_or.reduceat(bits, bounds).reshape(-1, 3)[:, :2]
+    not_items = np.add.reduceat(bits == 0, bounds).reshape(-1, 3)[:, :2].sum(axis=1)
+
+    priorities, bad_common = _single_item_priorities(compartments[:, 0] & compartments[:, 1])
+    bad_sacks = bad_common | (lengths % 2 == 1) | (not_items > 0)
+
+    sacks = compartments[:, 0] | compartments[:, 1]
+    num_groups = len(sacks) // group_size
+    badges = np.bitwise_and.reduce(sacks[:num_groups*group_size].reshape(-1, group_size), axis=1)
+    badge_priorities, bad_badges = _single_item_priorities(badges)
+    bad_badges |= bad_sacks[:num_groups*group_size].reshape(-1, group_size).any(axis=1)
+    bad_groups = np.flatnonzero(bad_badges)
+    if len(sacks) % group_size:
+        bad_groups = np.append(bad_groups, num_groups)  # incomplete last group
+
+    return BatchPriorities(
+        common_item_priority=int(priorities[~bad_sacks].sum()),
+        badge_priority=int(badge_priorities[~bad_badges].sum()),
+        bad_sacks=np.flatnonzero(bad_sacks),
+        bad_groups=bad_groups,
+    )
     
 
 if __name__ == '__main__':
@@ -68,3 +162,6 @@ if __name__ == '__main__':
     print()
     print(f'[SAMPLE] Total priority of group badges: {total_badge_priority(SAMPLE_INPUT)}')
     print(f'[REAL  ] Total priority of group badges: {total_badge_priority(INPUT)}')
+    print()
+    print(f'[SAMPLE] Batch priorities: {batch_priorities(SAMPLE_INPUT)}')
+    print(f'[REAL  ] Batch priorities: {batch_priorities(INPUT)}')
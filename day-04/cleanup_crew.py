@@ -2,11 +2,14 @@
 """
 from __future__ import annotations
 from attrs import frozen
+from collections import Counter
 from pathlib import Path
+from typing import Iterable
 
 
-SAMPLE_INPUT = Path('sample-input.txt')
-INPUT = Path('input.txt')
+DATA_DIR = Path(__file__).parent
+SAMPLE_INPUT = DATA_DIR / 'sample-input.txt'
+INPUT = DATA_DIR / 'input.txt'
 
 
 @frozen
@@ -54,7 +57,123 @@ def parse_line(line) -> tuple[Range, Range]:
     if len(parts) != 2: 
         raise ValueError(f'Could not parse {line} as pair of Ranges')
     return tuple(Range.from_string(x) for x in parts)
-        
+
+
+def all_ranges(pairs_path: Path) -> list[Range]:
+    """Return every range from every pair in the input file
+    """
+    ranges = []
+    with open(pairs_path, 'r') as fp:
+        for line in fp.readlines():
+            ranges.extend(parse_line(line.strip()))
+    return ranges
+
+
+@frozen
+class IntervalSet:
+    """Set of integers stored as sorted, disjoint, non-adjacent Ranges
+    """
+
+    ranges: tuple[Range, ...] = ()
+
+    @classmethod
+    def from_ranges(cls, ranges: Iterable[Range]) -> IntervalSet:
+        """Merge any collection of ranges into a new IntervalSet by sort-and-sweep"""
+        merged = []
+        for r in sorted(ranges, key=lambda x: x.min):
+            if merged and r.min <= merged[-1].max + 1:
+                if r.max > merged[-1].max:
+                    merged[-1] = Range(merged[-1].min, r.max)
+            else:
+                merged.append(r)
+        return cls(tuple(merged))
+
+    def __len__(self):
+        """The number of integers included in this set"""
+        return sum(len(r) for r in self.ranges)
+
+    def __contains__(self, value: int) -> bool:
+        lo, hi = 0, len(self.ranges)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.ranges[mid].max < value:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo < len(self.ranges) and self.ranges[lo].min <= value
+
+    def union(self, other: IntervalSet) -> IntervalSet:
+        """Return integers in this set or other"""
+        return IntervalSet.from_ranges(self.ranges + other.ranges)
+
+    def intersection(self, other: IntervalSet) -> IntervalSet:
+        """Return integers in both this set and other"""
+        result = []
+        i = j = 0
+        while i < len(self.ranges) and j < len(other.ranges):
+            a, b = self.ranges[i], other.ranges[j]
+            if a.intersects(b):
+                result.append(Range(max(a.min, b.min), min(a.max, b.max)))
+            # advance whichever range ends first
+            if a.max < b.max:
+                i += 1
+            else:
+                j += 1
+        return IntervalSet(tuple(result))
+
+    def difference(self, other: IntervalSet) -> IntervalSet:
+        """Return integers in this set but not in other"""
+        result = []
+        j = 0
+        for a in self.ranges:
+            start = a.min
+            # skip ranges in other that end before this one starts
+            while j < len(other.ranges) and other.ranges[j].max < start:
+                j += 1
+            k = j
+            while k < len(other.ranges) and other.ranges[k].min <= a.max:
+                b = other.ranges[k]
+                if b.min > start:
+                    result.append(Range(start, b.min - 1))
+                start = max(start, b.max + 1)
+                k += 1
+            if start <= a.max:
+                result.append(Range(start, a.max))
+        return IntervalSet(tuple(result))
+
+
+def coverage_depths(ranges: Iterable[Range]) -> dict[int, int]:
+    """Return a histogram mapping depth to the number of integers covered by exactly
+    that many of 'ranges', for depth >= 1, using a sweep over sorted endpoints
+    """
+    deltas = Counter()
+    for r in ranges:
+        deltas[r.min] += 1
+        deltas[r.max + 1] -= 1
+
+    histogram = Counter()
+    depth = 0
+    previous = None
+    for position in sorted(deltas):
+        if depth > 0:
+            histogram[depth] += position - previous
+        depth += deltas[position]
+        previous = position
+    return dict(sorted(histogram.items()))
+
+
+def count_covered(ranges: Iterable[Range], min_depth: int = 1) -> int:
+    """Return the number of integers covered by at least 'min_depth' of 'ranges'
+    """
+    return sum(count for depth, count in coverage_depths(ranges).items() if depth >= min_depth)
+
+
+def count_uncovered(ranges: Iterable[Range], bounds: Range) -> int:
+    """Return the number of integers in 'bounds' not covered by any of 'ranges'
+    """
+    covered = IntervalSet.from_ranges(ranges).intersection(IntervalSet((bounds,)))
+    return len(bounds) - len(covered)
+
 
 
 def count_contains(pairs_path: Path):
@@ -95,3 +214,6 @@ if __name__ == '__main__':
     print()
     print(f'[SAMPLE]: Pairs where ranges intersect {count_intersects(SAMPLE_INPUT)}')
     print(f'[REAL  ]: Pairs where ranges intersect {count_intersects(INPUT)}')
+    print()
+    print(f'[SAMPLE]: Merged sections covered {IntervalSet.from_ranges(all_ranges(SAMPLE_INPUT))}')
+    print(f'[REAL  ]: Sections covered by 2 or more elves {count_covered(all_ranges(INPUT), 2)}')
@@ -1,13 +1,15 @@
 """Advent of Code - Day ##
 """
-from attrs import frozen, field
+from __future__ import annotations
+from attrs import define, frozen, field
 from pathlib import Path
 import re
-from pprint import pprint
+from typing import Callable, Optional
 
 
-SAMPLE_INPUT = Path('sample-input.txt')
-INPUT = Path('input.txt')
+DATA_DIR = Path(__file__).parent
+SAMPLE_INPUT = DATA_DIR / 'sample-input.txt'
+INPUT = DATA_DIR / 'input.txt'
 
 
 @frozen
@@ -54,35 +56,215 @@ def parse_input(input_path: Path):
         return stacks, instructions
 
 
-def crate_mover_9000(stacks, instructions):
-    """Apply instructions to the input stacks (mutating the stacks in the process)
-    Return the top crate from each stack (in order)
+def _parse_drawing(lines: list[str], labels: str) -> dict[int, list[str]]:
+    """Parse the lines of the stack drawing (above the 'labels' line) to a dictionary
+    mapping stack label to a list of crates, bottom elements first
     """
-    for i in instructions:
-        for _ in range(i.count):
-            stacks[i.to_stack].append(stacks[i.from_stack].pop())
-    
+    num_stacks = int(labels.strip()[-1])
+    width = 4*num_stacks
+    columns = zip(*(line.rstrip('\n').ljust(width)[1:width:4] for line in reversed(lines)))
+    return {
+        x: [crate for crate in column if crate != ' ']
+        for x, column in enumerate(columns, start=1)
+    }
+
+
+# translation table replacing everything but digits and whitespace with spaces
+_NOT_DIGITS = {x: ' ' for x in range(128) if not chr(x).isdigit() and not chr(x).isspace()}
+
+
+def parse_input_bulk(input_path: Path) -> tuple[dict[int, list[str]], np.ndarray]:
+    """Parse input file in bulk and return:
+    * dictionary mapping stack label to a list of the crates in the stack
+    * (n, 3) integer array of (count, from_stack, to_stack) instructions
+    """
+    import numpy as np
+
+    with open(input_path, 'r') as fp:
+        drawing, _, moves = fp.read().partition('\n\n')
+
+    *lines, labels = drawing.split('\n')
+    stacks = _parse_drawing(lines, labels)
+
+    # drop the words, leaving only the numbers, 3 per instruction
+    numbers = moves.translate(_NOT_DIGITS).split()
+    if len(numbers) % 3:
+        raise ValueError('Expect 3 numbers per instruction')
+    instructions = np.array(numbers, dtype=np.int64).reshape(-1, 3)
+
+    return stacks, instructions
+
+
+def _compact(values) -> np.ndarray:
+    """Return non-negative integer 'values' as an array of the smallest unsigned dtype that fits"""
+    import numpy as np
+
+    values = np.asarray(values, dtype=np.int64)
+    if values.size and values.min() < 0:
+        raise ValueError('Expect non-negative values')
+    return values.astype(np.min_scalar_type(int(values.max()) if values.size else 0))
+
+
+def save_plan(plan_path: Path, stacks: dict[int, list[str]], instructions: np.ndarray) -> None:
+    """Save initial stacks and (n, 3) array of instructions to a compact binary file,
+    storing each array in the smallest integer type that fits it
+    """
+    import numpy as np
+
+    labels = sorted(stacks.keys())
+    # write through a file handle, since np.savez would add '.npz' to a path without it
+    with open(plan_path, 'wb') as fp:
+        np.savez(
+            fp, 
+            labels=_compact(labels),
+            heights=_compact([len(stacks[x]) for x in labels]),
+            crates=np.frombuffer(''.join(''.join(stacks[x]) for x in labels).encode(), dtype=np.uint8),
+            instructions=_compact(instructions).reshape(-1, 3),
+        )
+
+
+def load_plan(plan_path: Path) -> tuple[dict[int, list[str]], np.ndarray]:
+    """Load initial stacks and (n, 3) array of instructions saved with save_plan
+    """
+    import numpy as np
+
+    with np.load(plan_path) as data:
+        crates = data['crates'].tobytes().decode()
+        offsets = np.concatenate([[0], np.cumsum(data['heights'], dtype=np.int64)]).tolist()
+        stacks = {
+            label: list(crates[start:stop]) 
+            for label, start, stop in zip(data['labels'].tolist(), offsets[:-1], offsets[1:])
+        }
+        return stacks, data['instructions'].astype(np.int64)
+
+
+def _moves(instructions):
+    """Return instructions, either a list of Instructions or an (n, 3) integer array, 
+    as an iterable of (count, from_stack, to_stack) tuples
+    """
+    if hasattr(instructions, 'tolist'):  # numpy array
+        return instructions.tolist()
+    return ((i.count, i.from_stack, i.to_stack) for i in instructions)
+
+
+def _apply_9000(stacks, moves) -> None:
+    """Apply (count, from_stack, to_stack) moves one crate at a time, mutating stacks"""
+    for count, from_stack, to_stack in moves:
+        for _ in range(count):
+            stacks[to_stack].append(stacks[from_stack].pop())
+
+
+def _apply_9001(stacks, moves) -> None:
+    """Apply (count, from_stack, to_stack) moves all crates at once, mutating stacks"""
+    for count, from_stack, to_stack in moves:
+        in_transit = stacks[from_stack][-count:]
+        del stacks[from_stack][-count:]
+        stacks[to_stack].extend(in_transit)
+
+
+def _top_crates(stacks) -> str:
+    """Return the top crate from each stack (in order), blank for empty stacks"""
     crates = []
     for k in sorted(stacks.keys()):
-        crates.append(stacks[k][-1])
+        crates.append(stacks[k][-1] if stacks[k] else ' ')
 
     return ''.join(crates)
 
+
+def crate_mover_9000(stacks, instructions):
+    """Apply instructions to the input stacks (mutating the stacks in the process)
+    Return the top crate from each stack (in order)
+    """
+    _apply_9000(stacks, _moves(instructions))
+    return _top_crates(stacks)
+
         
 def crate_mover_9001(stacks, instructions):
     """Apply instructions to the input stacks (mutating the stacks in the process)
     Return the top crate from each stack (in order)
     """
-    for i in instructions:
-        in_transit = stacks[i.from_stack][-i.count:]
-        stacks[i.from_stack] = stacks[i.from_stack][:-i.count]
-        stacks[i.to_stack].extend(in_transit)
-    
-    crates = []
-    for k in sorted(stacks.keys()):
-        crates.append(stacks[k][-1])
+    _apply_9001(stacks, _moves(instructions))
+    return _top_crates(stacks)
 
-    return ''.join(crates)
+
+CRATE_MOVERS: dict[int, Callable] = {9000: _apply_9000, 9001: _apply_9001}
+
+
+@define
+class CrateReplay:
+    """Replay instructions with a given crate mover model, keeping checkpoints of the 
+    stacks so that the state after any step can be recovered by replaying only from 
+    the nearest earlier checkpoint. The input stacks are not mutated.
+
+    Checkpoints are evenly spaced, and include the initial state. Memory is bounded by
+    keeping at most 'max_checkpoints' of them and, if 'max_checkpoint_crates' is set, 
+    at most that many crates across all of them (each checkpoint holds every crate, 
+    stored as one character).
+    """
+    stacks: dict[int, list[str]]
+    instructions: np.ndarray
+    model: int = 9000
+    max_checkpoints: int = 1024
+    max_checkpoint_crates: Optional[int] = None
+    _interval: int = field(init=False)
+    _checkpoints: list[dict[int, str]] = field(init=False)
+
+    def __attrs_post_init__(self):
+        if self.model not in CRATE_MOVERS:
+            raise ValueError(f'Unknown crate mover model: {self.model}')
+        if self.max_checkpoints < 1:
+            raise ValueError(f'Expect at least one checkpoint: {self.max_checkpoints}')
+        import numpy as np
+
+        if not isinstance(self.instructions, np.ndarray):
+            self.instructions = np.array(list(_moves(self.instructions)), dtype=np.int64).reshape(-1, 3)
+
+        num_checkpoints = self.max_checkpoints
+        if self.max_checkpoint_crates is not None:
+            num_crates = max(1, sum(len(x) for x in self.stacks.values()))
+            num_checkpoints = min(num_checkpoints, self.max_checkpoint_crates // num_crates)
+            if num_checkpoints < 1:
+                raise ValueError(f'Budget of {self.max_checkpoint_crates} crates is too small '
+                                 f'for one checkpoint of {num_crates} crates')
+
+        # checkpoint i is the state after i*interval steps, stacks stored as strings, 
+        #   the initial state takes one checkpoint and the rest are spread over the steps
+        num_steps = len(self.instructions)
+        if num_checkpoints == 1:
+            self._interval = num_steps + 1
+        else:
+            self._interval = max(1, -(-num_steps // (num_checkpoints - 1)))
+        stacks = {k: v.copy() for k, v in self.stacks.items()}
+        self._checkpoints = [self._freeze(stacks)]
+        for start in range(0, len(self.instructions) - self._interval + 1, self._interval):
+            self._apply(stacks, start, start + self._interval)
+            self._checkpoints.append(self._freeze(stacks))
+
+    @staticmethod
+    def _freeze(stacks: dict[int, list[str]]) -> dict[int, str]:
+        return {k: ''.join(v) for k, v in stacks.items()}
+
+    def _apply(self, stacks: dict[int, list[str]], start: int, stop: int) -> None:
+        CRATE_MOVERS[self.model](stacks, self.instructions[start:stop].tolist())
+
+    def __len__(self) -> int:
+        """The number of steps (instructions) in the replay"""
+        return len(self.instructions)
+
+    def stacks_at(self, step: int) -> dict[int, list[str]]:
+        """Return a new copy of the full stacks after the first 'step' instructions
+        """
+        if not 0 <= step <= len(self.instructions):
+            raise ValueError(f'Step {step} is out of range [0, {len(self.instructions)}]')
+        checkpoint = step // self._interval
+        stacks = {k: list(v) for k, v in self._checkpoints[checkpoint].items()}
+        self._apply(stacks, checkpoint*self._interval, step)
+        return stacks
+
+    def top_crates_at(self, step: int) -> str:
+        """Return the top crate from each stack (in order) after the first 'step' instructions
+        """
+        return _top_crates(self.stacks_at(step))
 
 
 if __name__ == '__main__':
@@ -92,6 +274,13 @@ if __name__ == '__main__':
 
     print(f'[SAMPLE]: top crates are: {crate_mover_9001(*parse_input(SAMPLE_INPUT))}')
     print(f'[REAL  ]: top crates are: {crate_mover_9001(*parse_input(INPUT))}')
+
+    print(f'[BULK  ]: top crates are: {crate_mover_9000(*parse_input_bulk(INPUT))}')
+    print(f'[BULK  ]: top crates are: {crate_mover_9001(*parse_input_bulk(INPUT))}')
+
+    replay = CrateReplay(*parse_input_bulk(INPUT), model=9001, max_checkpoints=16)
+    print(f'[REPLAY]: top crates at step 100 are: {replay.top_crates_at(100)}')
+    print(f'[REPLAY]: top crates at the end are: {replay.top_crates_at(len(replay))}')
         
     
 
@@ -1,14 +1,22 @@
 """Advent of Code - Day 6
 """
 
+from __future__ import annotations
+from attrs import frozen
 from pathlib import Path
+from typing import AsyncIterator, Mapping
 
 
-SAMPLE_INPUT_1 = Path('sample-input-1.txt')
-SAMPLE_INPUT_2 = Path('sample-input-2.txt')
-SAMPLE_INPUT_3 = Path('sample-input-3.txt')
-SAMPLE_INPUT_4 = Path('sample-input-4.txt')
-INPUT = Path('input.txt')
+DATA_DIR = Path(__file__).parent
+SAMPLE_INPUT_1 = DATA_DIR / 'sample-input-1.txt'
+SAMPLE_INPUT_2 = DATA_DIR / 'sample-input-2.txt'
+SAMPLE_INPUT_3 = DATA_DIR / 'sample-input-3.txt'
+SAMPLE_INPUT_4 = DATA_DIR / 'sample-input-4.txt'
+INPUT = DATA_DIR / 'input.txt'
+
+
+PACKET_WIDTH = 4
+MESSAGE_WIDTH = 14
 
 
 def start_idx(input_file: Path, width: int) -> int:
@@ -28,9 +36,220 @@ def start_idx(input_file: Path, width: int) -> int:
     raise ValueError(f'No sequence of width {width} found!')
 
 
+def read_buffer(input_file: Path) -> np.ndarray:
+    """Read input file to a 1D array of bytes, ignoring leading/trailing whitespace
+    """
+    import numpy as np
+
+    with open(input_file, 'rb') as fp:
+        return np.frombuffer(fp.read().strip(), dtype=np.uint8)
+
+
+def distinct_run_lengths(buf: np.ndarray) -> np.ndarray:
+    """Return the length of the longest run of unique characters ending at each 
+    position in 'buf', computed in one vectorized pass
+    """
+    import numpy as np
+
+    positions = np.arange(len(buf))
+
+    # index of the previous occurrence of each character (-1 if none), found by
+    #   grouping equal characters together with a stable sort
+    order = np.argsort(buf, kind='stable')
+    previous = np.full(len(buf), -1)
+    same_as_before = buf[order[1:]] == buf[order[:-1]]
+    previous[order[1:][same_as_before]] = order[:-1][same_as_before]
+
+    # a run ending at idx can't start at or before the last repeated character
+    run_start = np.maximum.accumulate(previous + 1) if len(buf) else previous
+    return positions - run_start + 1
+
+
+def start_indices(input_file: Path, max_width: int) -> dict[int, int]:
+    """Return a mapping from each width in 1..max_width to the index of the character 
+    after the first sequence of 'width' unique characters (as in start_idx). 
+    Widths with no such sequence are omitted.
+    """
+    import numpy as np
+
+    longest_so_far = np.maximum.accumulate(distinct_run_lengths(read_buffer(input_file)))
+    widths = np.arange(1, max_width + 1)
+    ends = np.searchsorted(longest_so_far, widths, side='left')
+    return {
+        int(width): int(end) + 1 
+        for width, end in zip(widths, ends) 
+        if end < len(longest_so_far)
+    }
+
+
+class MarkerDetector:
+    """Resumable detector for sequences of unique characters in a stream fed one chunk 
+    at a time. State is fixed size: the last position of each byte value and the start 
+    of the current run of unique characters, shared by all marker widths.
+    """
+
+    def __init__(self, widths: tuple[int, ...] = (PACKET_WIDTH, MESSAGE_WIDTH)):
+        self.position = 0
+        self._run_start = 0
+        self._last_seen = [-1]*256
+        self._pending = sorted(widths)
+
+    @property
+    def done(self) -> bool:
+        """True once markers for all widths have been found"""
+        return not self._pending
+
+    def feed(self, chunk: bytes) -> list[tuple[int, int]]:
+        """Process the next chunk of the stream, return (width, index) for each marker 
+        found in it, with index defined as in start_idx
+        """
+        found = []
+        last_seen, run_start, position = self._last_seen, self._run_start, self.position
+        for byte in chunk:
+            if last_seen[byte] >= run_start:
+                run_start = last_seen[byte] + 1
+            last_seen[byte] = position
+            position += 1
+            while self._pending and position - run_start >= self._pending[0]:
+                found.append((self._pending.pop(0), position))
+            if not self._pending:
+                break
+        self._run_start, self.position = run_start, position
+        return found
+
+
+@frozen
+class MarkerEvent:
+    """Marker of unique characters with length 'width' found in 'stream' ending just 
+    before 'index'
+    """
+    stream: str
+    width: int
+    index: int
+
+
+async def _watch_stream(
+    name: str, 
+    reader: asyncio.StreamReader, 
+    widths: tuple[int, ...], 
+    events: asyncio.Queue, 
+    wakeup: asyncio.Event,
+    chunk_size: int,
+) -> None:
+    """Feed chunks from 'reader' to a detector until all markers are found or the stream 
+    ends, putting events in the queue and setting 'wakeup' after each one
+    """
+    detector = MarkerDetector(widths)
+    while not detector.done and (chunk := await reader.read(chunk_size)):
+        for width, index in detector.feed(chunk):
+            await events.put(MarkerEvent(name, width, index))
+            wakeup.set()
+
+
+async def detect_markers(
+    readers: Mapping[str, asyncio.StreamReader],
+    widths: tuple[int, ...] = (PACKET_WIDTH, MESSAGE_WIDTH),
+    chunk_size: int = 4096,
+    max_pending: int = 1024,
+) -> AsyncIterator[MarkerEvent]:
+    """Watch many named streams concurrently, yielding a MarkerEvent as soon as each 
+    marker is found. At most 'max_pending' unconsumed events are held at a time. If 
+    any stream fails, its error is raised as soon as it happens. Closing the generator
+    early (e.g., with aclose) cancels and cleans up all of the watchers.
+    """
+    import asyncio
+
+    events = asyncio.Queue(maxsize=max_pending)
+    wakeup = asyncio.Event()
+    finished = []
+    failures = []
+
+    def on_done(task: asyncio.Task) -> None:
+        finished.append(task)
+        if not task.cancelled() and task.exception() is not None:
+            failures.append(task.exception())
+        wakeup.set()
+
+    tasks = [
+        asyncio.create_task(_watch_stream(name, reader, widths, events, wakeup, chunk_size))
+        for name, reader in readers.items()
+    ]
+    for task in tasks:
+        task.add_done_callback(on_done)
+
+    try:
+        while True:
+            while not events.empty() and not failures:
+                yield events.get_nowait()
+            if failures:
+                raise failures[0]
+            if len(finished) == len(tasks):
+                # watchers only finish after all their events are queued, so all are consumed
+                break
+            wakeup.clear()
+            await wakeup.wait()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _fake_stream(reader: asyncio.StreamReader, data: bytes, chunk_size: int) -> None:
+    """Feed 'data' to 'reader' one chunk at a time, yielding to other tasks in between"""
+    import asyncio
+
+    for start in range(0, len(data), chunk_size):
+        reader.feed_data(data[start:start + chunk_size])
+        await asyncio.sleep(0)
+    reader.feed_eof()
+
+
+async def benchmark_streams(num_streams: int, stream_length: int, chunk_size: int = 512) -> None:
+    """Time detect_markers on many local fake streams. Each stream is built so that its
+    message marker only appears at the very end, forcing the whole stream to be read.
+    """
+    import asyncio
+    import random
+    import time
+
+    # the prefix has too few letters for a message marker, and the padding run of 'a's
+    #   can add at most one more distinct letter to any window. The tail also starts 
+    #   with an 'a', so no window can cross from the padding into the tail, and the
+    #   tail itself is the only message marker.
+    rng = random.Random(0)
+    no_messages = b'abcdefghijklm'
+    padding = b'a' * (MESSAGE_WIDTH - 1)
+    tail = b'anopqrstuvwxyz'
+    streams = {}
+    producers = []
+    for idx in range(num_streams):
+        data = bytes(rng.choices(no_messages, k=stream_length)) + padding + tail
+        streams[f'stream-{idx}'] = asyncio.StreamReader()
+        producers.append(_fake_stream(streams[f'stream-{idx}'], data, chunk_size))
+    expected_index = stream_length + len(padding) + len(tail)
+
+    start = time.perf_counter()
+    producer_tasks = [asyncio.create_task(x) for x in producers]
+    num_events = 0
+    consumed = 0
+    async for event in detect_markers(streams):
+        num_events += 1
+        if event.width == MESSAGE_WIDTH:
+            if event.index != expected_index:
+                raise RuntimeError(f'Message marker in {event.stream} found early at {event.index}')
+            consumed += event.index
+    await asyncio.gather(*producer_tasks)
+    elapsed = time.perf_counter() - start
+
+    total_mb = consumed / 1e6
+    print(f'[BENCH] {num_streams} streams, {num_events} events, {total_mb:.1f} MB '
+          f'in {elapsed:.2f} s ({total_mb / elapsed:.2f} MB/s)')
+
 
 if __name__ == '__main__':
 
+    import asyncio
+
     print(f'[SAMPLE-1] Packet start at: {start_idx(SAMPLE_INPUT_1, 4)}')
     print(f'[SAMPLE-2] Packet start at: {start_idx(SAMPLE_INPUT_2, 4)}')
     print(f'[SAMPLE-3] Packet start at: {start_idx(SAMPLE_INPUT_3, 4)}')
@@ -42,3 +261,7 @@ if __name__ == '__main__':
     print(f'[SAMPLE-3] Message start at: {start_idx(SAMPLE_INPUT_3, 14)}')
     print(f'[SAMPLE-4] Message start at: {start_idx(SAMPLE_INPUT_4, 14)}')
     print(f'[REAL    ] Message start at: {start_idx(INPUT, 14)}')
+    print()
+    print(f'[REAL    ] Start at, by width: {start_indices(INPUT, 26)}')
+    print()
+    asyncio.run(benchmark_streams(num_streams=1000, stream_length=10_000))
@@ -2,13 +2,14 @@
 """
 
 from __future__ import annotations
-from attrs import define
+from attrs import define, frozen
 from pathlib import Path
 from typing import Union, Optional
 
 
-SAMPLE_INPUT = Path('sample-input.txt')
-INPUT = Path('input.txt')
+DATA_DIR = Path(__file__).parent
+SAMPLE_INPUT = DATA_DIR / 'sample-input.txt'
+INPUT = DATA_DIR / 'input.txt'
 
 
 @define
@@ -125,6 +126,118 @@ def smallest_sufficient_folder(root: Union[File, Folder]) -> Folder:
     return sorted(candidates, key=lambda x: x.size)[0]
 
 
+FOLDER = 0
+FILE = 1
+
+
+@frozen
+class FlatTree:
+    """File tree flattened to arrays, one entry per node in depth-first order so that
+    parents always come before their children. Node 0 is the root. Folder sizes are
+    totals, as for Folder.size. Names are concatenated in 'names', with node i's name
+    at names[name_offsets[i]:name_offsets[i+1]].
+    """
+    parent: np.ndarray  # parent node index, -1 for the root
+    kind: np.ndarray  # FOLDER or FILE
+    size: np.ndarray
+    name_offsets: np.ndarray
+    names: np.ndarray
+
+    def __len__(self):
+        return len(self.parent)
+
+    def name(self, idx: int) -> str:
+        """Return the name of node 'idx'"""
+        return self.names[self.name_offsets[idx]:self.name_offsets[idx + 1]].tobytes().decode()
+
+    def path(self, idx: int) -> str:
+        """Return the full path of node 'idx'"""
+        parts = []
+        while idx > 0:
+            parts.append(self.name(idx))
+            idx = int(self.parent[idx])
+        return '/' + '/'.join(reversed(parts))
+
+    def folder_sizes(self) -> np.ndarray:
+        """Return the sizes of all folders"""
+        return self.size[self.kind == FOLDER]
+
+    def sum_below_threshold(self, threshold: int) -> int:
+        """Return sum of sizes of all folders below a threshold size"""
+        sizes = self.folder_sizes()
+        return int(sizes[sizes < threshold].sum())
+
+    def smallest_sufficient_folder(self) -> int:
+        """Return the index of the smallest folder we can delete to free the minimum disk space"""
+        import numpy as np
+
+        disk_size = 70_000_000
+        min_empty_space = 30_000_000
+        space_to_free = min_empty_space - (disk_size - int(self.size[0]))
+
+        candidates = np.flatnonzero((self.kind == FOLDER) & (self.size >= space_to_free))
+        return int(candidates[np.argmin(self.size[candidates])])
+
+
+def flatten(root: Folder) -> FlatTree:
+    """Flatten the file tree under 'root' to arrays, without recursion"""
+    import numpy as np
+
+    parent, kind, size, names = [], [], [], []
+    stack = [(root, -1)]
+    while stack:
+        node, parent_idx = stack.pop()
+        parent.append(parent_idx)
+        names.append(node.name.encode())
+        if isinstance(node, Folder):
+            kind.append(FOLDER)
+            size.append(0)
+            idx = len(parent) - 1
+            stack.extend((child, idx) for child in reversed(node.children))
+        else:
+            kind.append(FILE)
+            size.append(node.size)
+
+    # children come after parents, so a reverse pass accumulates folder totals
+    for idx in range(len(parent) - 1, 0, -1):
+        size[parent[idx]] += size[idx]
+
+    lengths = np.fromiter((len(x) for x in names), dtype=np.int64, count=len(names))
+    return FlatTree(
+        parent=np.array(parent, dtype=np.int64),
+        kind=np.array(kind, dtype=np.uint8),
+        size=np.array(size, dtype=np.int64),
+        name_offsets=np.concatenate([[0], np.cumsum(lengths)]),
+        names=np.frombuffer(b''.join(names), dtype=np.uint8),
+    )
+
+
+_SNAPSHOT_ARRAYS = ('parent', 'kind', 'size', 'name_offsets', 'names')
+
+
+def save_snapshot(snapshot_dir: Path, tree: FlatTree) -> None:
+    """Save the flattened tree to a directory with one .npy file per array"""
+    import numpy as np
+
+    snapshot_dir = Path(snapshot_dir)
+    snapshot_dir.mkdir(parents=True, exist_ok=True)
+    for name in _SNAPSHOT_ARRAYS:
+        np.save(snapshot_dir / f'{name}.npy', getattr(tree, name))
+
+
+def load_snapshot(snapshot_dir: Path, mmap: bool = True) -> FlatTree:
+    """Load a flattened tree saved with save_snapshot. By default, the arrays are 
+    memory-mapped, so only the parts used by queries are read from disk.
+    """
+    import numpy as np
+
+    snapshot_dir = Path(snapshot_dir)
+    mmap_mode = 'r' if mmap else None
+    return FlatTree(
+        **{name: np.load(snapshot_dir / f'{name}.npy', mmap_mode=mmap_mode) for name in _SNAPSHOT_ARRAYS}
+    )
+
+
 if __name__ == '__main__':
 
     sample_root = inspect_disk(SAMPLE_INPUT)
@@ -135,6 +248,11 @@ if __name__ == '__main__':
     print()
     print(f'[SAMPLE] Size of the smallest folder we can delete: {smallest_sufficient_folder(sample_root)}')
     print(f'[REAL  ] Size of the smallest folder we can delete: {smallest_sufficient_folder(root)}')
+    print()
+    flat = flatten(root)
+    deletable = flat.smallest_sufficient_folder()
+    print(f'[FLAT  ] Total size of folders below threshold size: {flat.sum_below_threshold(100_000)}')
+    print(f'[FLAT  ] Smallest folder we can delete: {flat.path(deletable)}, {flat.size[deletable]}')
 
 
     all_folders(sample_root)
@@ -3,13 +3,13 @@
 
 from __future__ import annotations
 from pathlib import Path
-from attrs import frozen
-from pprint import pprint
-from collections import defaultdict
+from attrs import define, field, frozen
+import heapq
 
 
-SAMPLE_INPUT = Path('sample-input.txt')
-INPUT = Path('input.txt')
+DATA_DIR = Path(__file__).parent
+SAMPLE_INPUT = DATA_DIR / 'sample-input.txt'
+INPUT = DATA_DIR / 'input.txt'
 
 
 @frozen
@@ -117,6 +117,124 @@ def max_scenic_score(trees: list[list[Tree]]) -> int:
     return max(total_scores.values())
 
 
+def _line_visibility(heights: list[int]) -> list[bool]:
+    """Return True for each tree in the line that is visible from either end of it"""
+    visible = [False]*len(heights)
+    for indices in (range(len(heights)), range(len(heights) - 1, -1, -1)):
+        obstruction = -1
+        for idx in indices:
+            if heights[idx] > obstruction:
+                visible[idx] = True
+                obstruction = heights[idx]
+    return visible
+
+
+def _line_scores(heights: list[int]) -> list[int]:
+    """Return the product of the viewing distances in both directions along the line 
+    for each tree, using a stack of not-yet-blocked trees to stay linear in time
+    """
+    scores = [1]*len(heights)
+    for indices in (range(len(heights)), range(len(heights) - 1, -1, -1)):
+        taller = []
+        for idx in indices:
+            while taller and heights[taller[-1]] < heights[idx]:
+                taller.pop()
+            edge = indices[0]
+            scores[idx] *= abs(idx - (taller[-1] if taller else edge))
+            taller.append(idx)
+    return scores
+
+
+@define
+class Forest:
+    """Forest of tree heights that can be updated in place. Visibility and scenic scores
+    are split into row and column parts, so that changing one tree only requires 
+    recomputing its row and column. The best scenic score is kept in a lazy max-heap.
+    """
+    heights: list[list[int]]
+    _row_visible: list[list[bool]] = field(init=False)
+    _col_visible: list[list[bool]] = field(init=False)
+    _row_scores: list[list[int]] = field(init=False)
+    _col_scores: list[list[int]] = field(init=False)
+    _num_visible: int = field(init=False, default=0)
+    _best: list[tuple[int, int, int]] = field(init=False, factory=list)
+
+    @classmethod
+    def from_trees(cls, trees: list[list[Tree]]) -> Forest:
+        """Create a new Forest from a 2D array of Trees"""
+        return cls([[tree.height for tree in row] for row in trees])
+
+    def __attrs_post_init__(self):
+        num_rows, num_cols = len(self.heights), len(self.heights[0])
+        self.heights = [list(row) for row in self.heights]
+        self._row_visible = [_line_visibility(row) for row in self.heights]
+        self._row_scores = [_line_scores(row) for row in self.heights]
+        self._col_visible = [[False]*num_cols for _ in range(num_rows)]
+        self._col_scores = [[0]*num_cols for _ in range(num_rows)]
+        for col in range(num_cols):
+            self._update_col(col)
+        self._num_visible = sum(
+            self._is_visible(row, col) for row in range(num_rows) for col in range(num_cols)
+        )
+        self._rebuild_best()
+
+    def _rebuild_best(self) -> None:
+        self._best = [
+            (-self.scenic_score(row, col), row, col) 
+            for row in range(len(self.heights)) for col in range(len(self.heights[0]))
+        ]
+        heapq.heapify(self._best)
+
+    def _is_visible(self, row: int, col: int) -> bool:
+        return self._row_visible[row][col] or self._col_visible[row][col]
+
+    def scenic_score(self, row: int, col: int) -> int:
+        """Return the scenic score of the tree at (row, col)"""
+        return self._row_scores[row][col] * self._col_scores[row][col]
+
+    def _update_row(self, row: int) -> None:
+        self._row_visible[row] = _line_visibility(self.heights[row])
+        self._row_scores[row] = _line_scores(self.heights[row])
+
+    def _update_col(self, col: int) -> None:
+        heights = [row[col] for row in self.heights]
+        for row, (visible, score) in enumerate(zip(_line_visibility(heights), _line_scores(heights))):
+            self._col_visible[row][col] = visible
+            self._col_scores[row][col] = score
+
+    def set_height(self, row: int, col: int, height: int) -> None:
+        """Change the height of the tree at (row, col), updating visibility and scores
+        """
+        cells = [(row, x) for x in range(len(self.heights[0]))]
+        cells += [(x, col) for x in range(len(self.heights)) if x != row]
+
+        before = [(self._is_visible(*x), self.scenic_score(*x)) for x in cells]
+        self.heights[row][col] = height
+        self._update_row(row)
+        self._update_col(col)
+
+        for cell, (was_visible, old_score) in zip(cells, before):
+            self._num_visible += self._is_visible(*cell) - was_visible
+            new_score = self.scenic_score(*cell)
+            if new_score != old_score:
+                heapq.heappush(self._best, (-new_score, *cell))
+
+        # compact the heap once stale entries dominate it
+        if len(self._best) > 4*len(self.heights)*len(self.heights[0]):
+            self._rebuild_best()
+
+    def count_visible(self) -> int:
+        """Return the number of trees visible from the edges of the forest"""
+        return self._num_visible
+
+    def max_scenic_score(self) -> int:
+        """Return the maximum scenic score in the forest"""
+        # drop stale heap entries left behind by updates
+        while -self._best[0][0] != self.scenic_score(*self._best[0][1:]):
+            heapq.heappop(self._best)
+        return -self._best[0][0]
+
+
 
 if __name__ == '__main__':
 
@@ -128,3 +246,8 @@ if __name__ == '__main__':
     print()
     print(f'[SAMPLE] Maximum scenic score: {max_scenic_score(sample)}')
     print(f'[REAL  ] Maximum scenic score: {max_scenic_score(real)}')
+    print()
+    forest = Forest.from_trees(real)
+    forest.set_height(50, 50, 9)
+    print(f'[UPDATE] Trees visible from edges: {forest.count_visible()}')
+    print(f'[UPDATE] Maximum scenic score: {forest.max_scenic_score()}')
@@ -3,14 +3,15 @@
 
 from __future__ import annotations
 from pathlib import Path
-from attrs import frozen
-from typing import Generator
+from attrs import define, field, frozen
+from typing import Generator, Iterable, Iterator, Optional
 from math import copysign
 
 
-SAMPLE_INPUT_1 = Path('sample-input-1.txt')
-SAMPLE_INPUT_2 = Path('sample-input-2.txt')
-INPUT = Path('input.txt')
+DATA_DIR = Path(__file__).parent
+SAMPLE_INPUT_1 = DATA_DIR / 'sample-input-1.txt'
+SAMPLE_INPUT_2 = DATA_DIR / 'sample-input-2.txt'
+INPUT = DATA_DIR / 'input.txt'
 
 
 @frozen
@@ -25,6 +26,239 @@ class Position:
         return Position(self.row - other.row, self.col - other.col)
 
 
+def _pack(row: int, col: int) -> int:
+    """Pack a (row, col) cell with 32-bit coordinates to a single 64-bit integer key"""
+    return ((row + 2**31) << 32) | (col + 2**31)
+
+
+def _unpack(key: int) -> Position:
+    """Inverse of _pack"""
+    return Position((key >> 32) - 2**31, (key & 0xFFFF_FFFF) - 2**31)
+
+
+# approximate memory used per cell by sparse storage (set slot and int object), in bits
+_SPARSE_BITS_PER_CELL = 8*64
+
+# bitmaps up to this many cells are always allowed, however few cells are visited
+_MIN_BITMAP_CELLS = 2**16
+
+
+@define
+class VisitedCells:
+    """Compact set of visited cells. Cells are stored as a packed bitmap over a bounding
+    box that grows as new cells are added. Storage falls back to a set of packed integer
+    keys if the bitmap would exceed 'max_bitmap_cells' bits, or if it would be so empty 
+    that the set is smaller.
+    """
+    max_bitmap_cells: int = 2**27
+    _origin_row: int = field(default=0, init=False)
+    _origin_col: int = field(default=0, init=False)
+    _rows: int = field(default=0, init=False)
+    _cols: int = field(default=0, init=False)  # always a multiple of 8
+    _bits: bytearray = field(factory=bytearray, init=False)
+    _sparse: Optional[set[int]] = field(default=None, init=False)
+    _count: int = field(default=0, init=False)
+    # bounds of the visited cells, only meaningful if _count > 0
+    _min_row: int = field(default=0, init=False)
+    _max_row: int = field(default=0, init=False)
+    _min_col: int = field(default=0, init=False)
+    _max_col: int = field(default=0, init=False)
+
+    @property
+    def is_sparse(self) -> bool:
+        """True if cells are stored as packed integer keys rather than a bitmap"""
+        return self._sparse is not None
+
+    def _in_bounds(self, row: int, col: int) -> bool:
+        return (
+            0 <= row - self._origin_row < self._rows and 
+            0 <= col - self._origin_col < self._cols
+        )
+
+    def _too_sparse(self, num_cells: int, num_visited: int) -> bool:
+        """True if a bitmap of 'num_cells' should not be used to hold 'num_visited' cells"""
+        return num_cells > self.max_bitmap_cells or (
+            num_cells > _MIN_BITMAP_CELLS and 
+            num_cells > _SPARSE_BITS_PER_CELL * num_visited
+        )
+
+    def _to_sparse(self) -> None:
+        self._sparse = {_pack(row, col) for row, col in self._cells()}
+        self._bits = bytearray()
+        self._rows = self._cols = 0
+
+    def _grow(self, row: int, col: int) -> None:
+        """Expand the bitmap bounding box to include (row, col), or switch to sparse 
+        storage if the bitmap would get too big. Only a dimension that overflows is 
+        expanded, padded on the overflowing side by the visited extent in that dimension
+        so that repeated growth is amortized.
+        """
+        if self._rows == 0:
+            origin_row, rows, origin_col, cols = row - 4, 8, col - 32, 64
+
+        else:
+            origin_row, rows = self._origin_row, self._rows
+            if not 0 <= row - origin_row < rows:
+                low, high = min(row, self._min_row), max(row, self._max_row)
+                extent = high - low + 1
+                if row < origin_row:
+                    origin_row, rows = low - extent, origin_row + rows - (low - extent)
+                else:
+                    rows = high + extent - origin_row + 1
+
+            origin_col, cols = self._origin_col, self._cols
+            if not 0 <= col - origin_col < cols:
+                low, high = min(col, self._min_col), max(col, self._max_col)
+                extent = high - low + 1
+                if col < origin_col:
+                    # keep columns byte-aligned with the old bitmap so rows can be copied as bytes
+                    new_origin_col = low - extent
+                    new_origin_col -= (new_origin_col - origin_col) % 8
+                    origin_col, cols = new_origin_col, origin_col + cols - new_origin_col
+                else:
+                    cols = -(-(high + extent - origin_col + 1) // 8) * 8
+
+        if self._too_sparse(rows*cols, self._count + 1):
+            self._to_sparse()
+            return
+
+        bits = bytearray(rows*cols // 8)
+        old_stride, new_stride = self._cols // 8, cols // 8
+        row_offset = self._origin_row - origin_row
+        col_offset = (self._origin_col - origin_col) // 8
+        for r in range(self._rows):
+            start = (r + row_offset)*new_stride + col_offset
+            bits[start:start + old_stride] = self._bits[r*old_stride:(r + 1)*old_stride]
+
+        self._origin_row, self._origin_col = origin_row, origin_col
+        self._rows, self._cols = rows, cols
+        self._bits = bits
+
+    def _track_bounds(self, row: int, col: int) -> None:
+        """Update the bounds of the visited cells to include (row, col)"""
+        if self._count == 0:
+            self._min_row = self._max_row = row
+            self._min_col = self._max_col = col
+        else:
+            self._min_row, self._max_row = min(self._min_row, row), max(self._max_row, row)
+            self._min_col, self._max_col = min(self._min_col, col), max(self._max_col, col)
+
+    def add(self, row: int, col: int) -> None:
+        """Mark the cell at (row, col) as visited"""
+        row, col = int(row), int(col)
+
+        if self._sparse is None and not self._in_bounds(row, col):
+            self._grow(row, col)
+
+        if self._sparse is not None:
+            key = _pack(row, col)
+            if key not in self._sparse:
+                self._sparse.add(key)
+                self._track_bounds(row, col)
+                self._count += 1
+            return
+
+        idx = (row - self._origin_row)*self._cols + (col - self._origin_col)
+        mask = 1 << (idx & 7)
+        if not self._bits[idx >> 3] & mask:
+            self._bits[idx >> 3] |= mask
+            self._track_bounds(row, col)
+            self._count += 1
+
+    def update(self, cells: Iterable[Position]) -> None:
+        """Mark all of 'cells' as visited"""
+        for cell in cells:
+            self.add(cell.row, cell.col)
+
+    def _row_values(self) -> Iterator[tuple[int, int]]:
+        """Generator yielding (row, value) for each bitmap row with visited cells, where
+        bit i of the integer value is set if the cell at _origin_col + i is visited
+        """
+        if self._count == 0:
+            return
+        stride = self._cols // 8
+        empty = bytes(stride)
+        for r in range(self._min_row - self._origin_row, self._max_row - self._origin_row + 1):
+            chunk = self._bits[r*stride:(r + 1)*stride]
+            if chunk != empty:
+                yield self._origin_row + r, int.from_bytes(chunk, 'little')
+
+    def _cells(self) -> Iterator[tuple[int, int]]:
+        """Generator yielding (row, col) for all visited cells"""
+        if self._sparse is not None:
+            for key in self._sparse:
+                cell = _unpack(key)
+                yield cell.row, cell.col
+            return
+        for row, value in self._row_values():
+            while value:
+                lowest = value & -value
+                yield row, self._origin_col + lowest.bit_length() - 1
+                value ^= lowest
+
+    def _or_bitmap(self, other: VisitedCells) -> None:
+        """OR the rows of the bitmap in 'other' into this bitmap, which must already cover
+        all of its visited cells
+        """
+        stride = self._cols // 8
+        shift = other._origin_col - self._origin_col
+        for row, value in other._row_values():
+            value = value << shift if shift >= 0 else value >> -shift
+            start = (row - self._origin_row)*stride
+            current = int.from_bytes(self._bits[start:start + stride], 'little')
+            self._bits[start:start + stride] = (current | value).to_bytes(stride, 'little')
+
+    def union(self, other: VisitedCells) -> VisitedCells:
+        """Return a new store containing the cells visited in either this or other"""
+        result = VisitedCells(max_bitmap_cells=self.max_bitmap_cells)
+        parts = [x for x in (self, other) if x._count]
+        if not parts:
+            return result
+
+        min_row = min(x._min_row for x in parts)
+        max_row = max(x._max_row for x in parts)
+        min_col = min(x._min_col for x in parts)
+        max_col = max(x._max_col for x in parts)
+        rows = max_row - min_row + 1
+        cols = -(-(max_col - min_col + 1) // 8) * 8
+
+        result._min_row, result._max_row = min_row, max_row
+        result._min_col, result._max_col = min_col, max_col
+
+        if any(x.is_sparse for x in parts) or result._too_sparse(rows*cols, len(self) + len(other)):
+            result._sparse = {_pack(row, col) for x in parts for row, col in x._cells()}
+            result._count = len(result._sparse)
+        else:
+            result._origin_row, result._origin_col = min_row, min_col
+            result._rows, result._cols = rows, cols
+            result._bits = bytearray(rows*cols // 8)
+            for x in parts:
+                result._or_bitmap(x)
+            stride = cols // 8
+            result._count = sum(
+                bin(int.from_bytes(result._bits[r*stride:(r + 1)*stride], 'little')).count('1')
+                for r in range(rows)
+            )
+
+        return result
+
+    def __contains__(self, cell: Position) -> bool:
+        row, col = int(cell.row), int(cell.col)
+        if self._sparse is not None:
+            return _pack(row, col) in self._sparse
+        if not self._in_bounds(row, col):
+            return False
+        idx = (row - self._origin_row)*self._cols + (col - self._origin_col)
+        return bool(self._bits[idx >> 3] & (1 << (idx & 7)))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[Position]:
+        """Export all visited cells as Positions"""
+        for row, col in self._cells():
+            yield Position(row, col)
+
 
 def head_moves(input_file: Path) -> Generator[Position, None, None]:
     """Generator that yields a sequence of single-step moves parsed from 'input_file'
@@ -78,13 +312,13 @@ def count_tail_positions(input_file: Path, rope_length: int):
     """
     rope = [Position(0, 0) for _ in range(rope_length)]
 
-    tail_positions = set()
+    tail_positions = VisitedCells()
 
     for head_move in head_moves(input_file):
         rope[0] = rope[0] + head_move
         for idx in range(1, rope_length):
             rope[idx] = rope[idx] + tail_move(rope[idx-1], rope[idx])
-        tail_positions.add(rope[-1])
+        tail_positions.add(rope[-1].row, rope[-1].col)
 
     return len(tail_positions)
                 
@@ -6,9 +6,10 @@ from pathlib import Path
 from attrs import define, evolve
 
 
-SAMPLE_INPUT_1 = Path('sample-input-1.txt')
-SAMPLE_INPUT_2 = Path('sample-input-2.txt')
-INPUT = Path('input.txt')
+DATA_DIR = Path(__file__).parent
+SAMPLE_INPUT_1 = DATA_DIR / 'sample-input-1.txt'
+SAMPLE_INPUT_2 = DATA_DIR / 'sample-input-2.txt'
+INPUT = DATA_DIR / 'input.txt'
 
 
 @define